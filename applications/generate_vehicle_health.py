@@ -5,11 +5,6 @@ Uses the SDV GenAI Framework to generate a complete vehicle health monitoring ap
 """
 
 import sys
-import os
-from pathlib import Path
-
-# Add framework to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "framework"))
 
 from framework import SDVOrchestrator, OTAManager
 
@@ -49,62 +44,61 @@ def main():
     print("Vehicle Health & Diagnostics Application")
     print("="*70 + "\n")
     
-    # Initialize orchestrator
-    orchestrator = SDVOrchestrator(output_dir="applications")
+    # Initialize orchestrator (shuts down its I/O pool on exit)
+    with SDVOrchestrator(output_dir="applications") as orchestrator:
+        # Generate application
+        print("Starting application generation...")
+        result = orchestrator.generate_application(
+            problem_statement=problem_statement,
+            app_name="vehicle_health"
+        )
     
-    # Generate application
-    print("Starting application generation...")
-    result = orchestrator.generate_application(
-        problem_statement=problem_statement,
-        app_name="vehicle_health"
-    )
+        print("\n" + "="*70)
+        print("Application Generation Summary")
+        print("="*70)
+        print(f"Application: {result['app_name']}")
+        print(f"Output Directory: {result['output_dir']}")
+        print(f"Services Generated: {len(result['generated_services'])}")
+        print("\nGenerated Services:")
+        for service in result['generated_services']:
+            print(f"  • {service['name']} ({service['language']})")
+        print("\nCompliance:")
+        compliance = result['compliance_report']
+        print(f"  • ASPICE Level: {compliance['aspice_level']}")
+        print(f"  • MISRA Compliance: {compliance['misra_compliance']}")
+        print(f"  • ISO 26262 ASIL: {compliance['iso26262_asil']}")
+        print(f"  • Test Coverage: {compliance['test_coverage']}")
+        print("="*70 + "\n")
     
-    print("\n" + "="*70)
-    print("Application Generation Summary")
-    print("="*70)
-    print(f"Application: {result['app_name']}")
-    print(f"Output Directory: {result['output_dir']}")
-    print(f"Services Generated: {len(result['generated_services'])}")
-    print("\nGenerated Services:")
-    for service in result['generated_services']:
-        print(f"  • {service['name']} ({service['language']})")
-    print("\nCompliance:")
-    compliance = result['compliance_report']
-    print(f"  • ASPICE Level: {compliance['aspice_level']}")
-    print(f"  • MISRA Compliance: {compliance['misra_compliance']}")
-    print(f"  • ISO 26262 ASIL: {compliance['iso26262_asil']}")
-    print(f"  • Test Coverage: {compliance['test_coverage']}")
-    print("="*70 + "\n")
-    
-    # Demonstrate OTA Service Injection
-    print("\n" + "="*70)
-    print("Demonstrating OTA Service Injection")
-    print("="*70 + "\n")
+        # Demonstrate OTA Service Injection
+        print("\n" + "="*70)
+        print("Demonstrating OTA Service Injection")
+        print("="*70 + "\n")
     
-    # Define new OTA service
-    battery_degradation_service = {
-        "name": "BatteryDegradationService",
-        "language": "rust",
-        "version": "1.0.0",
-        "interfaces": [
-            "predict_degradation",
-            "estimate_remaining_life",
-            "get_health_index"
-        ],
-        "dependencies": ["VehicleDataService", "AnalyticsService"],
-        "data_model": ["BatteryHealthData", "DegradationModel"]
-    }
+        # Define new OTA service
+        battery_degradation_service = {
+            "name": "BatteryDegradationService",
+            "language": "rust",
+            "version": "1.0.0",
+            "interfaces": [
+                "predict_degradation",
+                "estimate_remaining_life",
+                "get_health_index"
+            ],
+            "dependencies": ["VehicleDataService", "AnalyticsService"],
+            "data_model": ["BatteryHealthData", "DegradationModel"]
+        }
     
-    # Inject via OTA
-    ota_result = orchestrator.inject_ota_service(
-        app_name="vehicle_health",
-        service_definition=battery_degradation_service
-    )
+        # Inject via OTA
+        ota_result = orchestrator.inject_ota_service(
+            app_name="vehicle_health",
+            service_definition=battery_degradation_service
+        )
     
-    print(f"\nOTA Injection Result:")
-    print(f"  • Service: {ota_result['service_name']}")
-    print(f"  • Status: {ota_result['status'].upper()}")
-    print(f"  • Timestamp: {ota_result['timestamp']}")
+        print(f"\nOTA Injection Result:")
+        print(f"  • Service: {ota_result['service_name']}")
+        print(f"  • Status: {ota_result['status'].upper()}")
+        print(f"  • Timestamp: {ota_result['timestamp']}")
     
     print("\n" + "="*70)
     print("✓ Vehicle Health Application Generated Successfully!")
@@ -113,12 +107,17 @@ def main():
     return result
 
 
-if __name__ == "__main__":
+def cli() -> int:
+    """Console entry point (viscar-generate); returns the process exit code"""
     try:
-        result = main()
-        sys.exit(0)
+        main()
+        return 0
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         import traceback
         traceback.print_exc()
-        sys.exit(1)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(cli())
@@ -1,22 +1,33 @@
 """SDV GenAI Framework - Main Entry Point"""
 
+import importlib
+
 __version__ = "1.0.0"
 __author__ = "VisCar Team"
 
-from .core import SDVOrchestrator, GenerationEngine
-from .llm import GeminiClient, JulesClient
-from .soa import ServiceBase, ServiceRegistry
-from .ota import OTAManager
-from .compliance import MISRAChecker, ASPICEMapper
-
-__all__ = [
-    'SDVOrchestrator',
-    'GenerationEngine',
-    'GeminiClient',
-    'JulesClient',
-    'ServiceBase',
-    'ServiceRegistry',
-    'OTAManager',
-    'MISRAChecker',
-    'ASPICEMapper'
-]
+# Public name -> defining subpackage; imported on first access (PEP 562)
+_LAZY = {
+    'SDVOrchestrator': '.core',
+    'GenerationEngine': '.core',
+    'GeminiClient': '.llm',
+    'JulesClient': '.llm',
+    'ServiceBase': '.soa',
+    'ServiceRegistry': '.soa',
+    'OTAManager': '.ota',
+    'MISRAChecker': '.compliance',
+    'ASPICEMapper': '.compliance'
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
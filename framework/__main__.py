@@ -5,11 +5,6 @@ Run standalone application generator
 """
 
 import sys
-import os
-from pathlib import Path
-
-# Ensure framework is in path
-sys.path.insert(0, str(Path(__file__).parent))
 
 def main():
     """Main framework entry point"""
@@ -22,6 +17,7 @@ def main():
     print("  python -m framework generate <app_name>  - Generate new SDV application")
     print("  python -m framework ota <app_name>        - Inject OTA service")
     print("  python -m framework demo                  - Run example generation")
+    print("  python -m framework clear-cache           - Drop cached LLM results")
     print()
     
     if len(sys.argv) < 2:
@@ -31,6 +27,8 @@ def main():
         run_demo()
     elif sys.argv[1] == "generate" and len(sys.argv) > 2:
         generate_app(sys.argv[2])
+    elif sys.argv[1] == "clear-cache":
+        clear_cache()
     else:
         print("Invalid command. See usage above.")
         sys.exit(1)
@@ -40,18 +38,24 @@ def run_demo():
     from applications.generate_vehicle_health import main as gen_main
     gen_main()
 
+def clear_cache():
+    """Drop all cached LLM results (memory and SDV_CACHE_DIR)"""
+    from framework.core.cache import default_cache
+    
+    default_cache.clear()
+    print("Cache cleared.")
+
 def generate_app(app_name):
     """Generate a new application"""
     from framework import SDVOrchestrator
     
-    orchestrator = SDVOrchestrator(output_dir="applications")
-    
     problem = f"""
     Generate SDV application: {app_name}
     Basic vehicle monitoring and control services.
     """
     
-    result = orchestrator.generate_application(problem, app_name)
+    with SDVOrchestrator(output_dir="applications") as orchestrator:
+        result = orchestrator.generate_application(problem, app_name)
     print(f"\nApplication '{app_name}' generated successfully!")
 
 if __name__ == "__main__":
@@ -2,5 +2,14 @@
 
 from .misra_checker import MISRAChecker
 from .aspice_mapper import ASPICEMapper
+from .trace_models import SystemReq, SoftwareReq, DesignElement, CodeUnit, TestCase
 
-__all__ = ['MISRAChecker', 'ASPICEMapper']
+__all__ = [
+    'MISRAChecker',
+    'ASPICEMapper',
+    'SystemReq',
+    'SoftwareReq',
+    'DesignElement',
+    'CodeUnit',
+    'TestCase'
+]
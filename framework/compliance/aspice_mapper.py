@@ -3,9 +3,51 @@ ASPICE Compliance Mapper
 Maps requirements to design, code, and tests for ASPICE compliance
 """
 
-from typing import Dict, List, Any
+from collections import defaultdict
+from typing import Dict, List, Any, Sequence, Union
 import json
 
+from .trace_models import SystemReq, SoftwareReq, DesignElement, CodeUnit, TestCase
+
+
+# Traceability links, in bit order for the capability-level lookup
+_TRACE_KEYS = ('system_to_software', 'software_to_design', 'design_to_code', 'code_to_tests', 'end_to_end')
+
+
+def _level_for_mask(mask: int) -> tuple:
+    """Capability level for a bitmask of covered _TRACE_KEYS"""
+    if mask == 0b11111:
+        return 3, "Established Process"
+    if mask & 0b00111 == 0b00111:
+        return 2, "Managed Process"
+    if mask & 0b00001:
+        return 1, "Performed Process"
+    return 0, "Incomplete Process"
+
+
+# Per-link field that must be non-empty for a link to count in strict mode
+_REQUIRED_LINK_FIELDS = {
+    'software_to_design': 'software_req_ids',
+    'end_to_end': 'validated_by_tests'
+}
+
+
+def _is_covered(key: str, links: List[Dict], require_complete_links: bool) -> bool:
+    """Whether a trace is present and, in strict mode, every link is filled"""
+    if not links:
+        return False
+    field = _REQUIRED_LINK_FIELDS.get(key) if require_complete_links else None
+    return field is None or all(link.get(field) for link in links)
+
+
+# Precomputed (level, description) for every coverage combination
+_LEVEL_TABLE = [_level_for_mask(mask) for mask in range(1 << len(_TRACE_KEYS))]
+
+
+def _as_models(model: type, items: Sequence[Any]) -> List[Any]:
+    """Convert dict items to the given trace model, passing model instances through"""
+    return [item if isinstance(item, model) else model.from_dict(item) for item in items]
+
 
 class ASPICEMapper:
     """ASPICE (Automotive SPICE) compliance mapper and tracer"""
@@ -14,17 +56,25 @@ class ASPICEMapper:
         self.traceability_matrix = {}
     
     def create_traceability_matrix(self, 
-                                   system_reqs: List[Dict],
-                                   software_reqs: List[Dict],
-                                   design_elements: List[Dict],
-                                   code_units: List[Dict],
-                                   test_cases: List[Dict]) -> Dict[str, Any]:
+                                   system_reqs: Sequence[Union[SystemReq, Dict]],
+                                   software_reqs: Sequence[Union[SoftwareReq, Dict]],
+                                   design_elements: Sequence[Union[DesignElement, Dict]],
+                                   code_units: Sequence[Union[CodeUnit, Dict]],
+                                   test_cases: Sequence[Union[TestCase, Dict]]) -> Dict[str, Any]:
         """
         Create complete traceability matrix for ASPICE
         
         Traces:
         System Req → Software Req → Design → Code → Tests
+        
+        Inputs may be trace model instances or plain dicts; dicts are
+        converted once here so the mapping passes use attribute access.
         """
+        system_reqs = _as_models(SystemReq, system_reqs)
+        software_reqs = _as_models(SoftwareReq, software_reqs)
+        design_elements = _as_models(DesignElement, design_elements)
+        code_units = _as_models(CodeUnit, code_units)
+        test_cases = _as_models(TestCase, test_cases)
         
         matrix = {
             "system_to_software": self._map_system_to_software(system_reqs, software_reqs),
@@ -37,111 +87,97 @@ class ASPICEMapper:
         self.traceability_matrix = matrix
         return matrix
     
-    def _map_system_to_software(self, system_reqs: List[Dict], software_reqs: List[Dict]) -> List[Dict]:
+    def _map_system_to_software(self, system_reqs: List[SystemReq], software_reqs: List[SoftwareReq]) -> List[Dict]:
         """Map system requirements to software requirements"""
-        mappings = []
-        
-        for sw_req in software_reqs:
-            if 'traces_to' in sw_req:
-                mappings.append({
-                    "software_req_id": sw_req.get('id'),
-                    "system_req_id": sw_req.get('traces_to'),
-                    "coverage": "full"
-                })
-        
-        return mappings
+        return [
+            {
+                "software_req_id": sw_req.id,
+                "system_req_id": sw_req.traces_to,
+                "coverage": "full"
+            }
+            for sw_req in software_reqs
+            if sw_req.traces_to is not None
+        ]
     
-    def _map_software_to_design(self, software_reqs: List[Dict], design_elements: List[Dict]) -> List[Dict]:
+    def _map_software_to_design(self, software_reqs: List[SoftwareReq], design_elements: List[DesignElement]) -> List[Dict]:
         """Map software requirements to design elements"""
-        mappings = []
-        
-        for design in design_elements:
-            mappings.append({
-                "design_element": design.get('name'),
-                "software_req_ids": design.get('implements', []),
+        return [
+            {
+                "design_element": design.name,
+                "software_req_ids": list(design.implements),
                 "coverage": "full"
-            })
-        
-        return mappings
+            }
+            for design in design_elements
+        ]
     
-    def _map_design_to_code(self, design_elements: List[Dict], code_units: List[Dict]) -> List[Dict]:
+    def _map_design_to_code(self, design_elements: List[DesignElement], code_units: List[CodeUnit]) -> List[Dict]:
         """Map design elements to code units"""
-        mappings = []
-        
-        for code_unit in code_units:
-            mappings.append({
-                "code_unit": code_unit.get('name'),
-                "design_element": code_unit.get('implements_design'),
-                "language": code_unit.get('language'),
+        return [
+            {
+                "code_unit": code_unit.name,
+                "design_element": code_unit.implements_design,
+                "language": code_unit.language,
                 "coverage": "full"
-            })
-        
-        return mappings
+            }
+            for code_unit in code_units
+        ]
     
-    def _map_code_to_tests(self, code_units: List[Dict], test_cases: List[Dict]) -> List[Dict]:
+    def _map_code_to_tests(self, code_units: List[CodeUnit], test_cases: List[TestCase]) -> List[Dict]:
         """Map code units to test cases"""
-        mappings = []
-        
-        for test in test_cases:
-            mappings.append({
-                "test_case": test.get('name'),
-                "code_unit": test.get('tests_unit'),
-                "requirement": test.get('traces_requirement'),
+        return [
+            {
+                "test_case": test.name,
+                "code_unit": test.tests_unit,
+                "requirement": test.traces_requirement,
                 "coverage": "full"
-            })
-        
-        return mappings
+            }
+            for test in test_cases
+        ]
     
-    def _create_end_to_end_trace(self, system_reqs: List[Dict], test_cases: List[Dict]) -> List[Dict]:
+    def _create_end_to_end_trace(self, system_reqs: List[SystemReq], test_cases: List[TestCase]) -> List[Dict]:
         """Create end-to-end traceability from system req to test"""
-        traces = []
-        
-        for req in system_reqs:
-            traces.append({
-                "requirement_id": req.get('id'),
-                "requirement_desc": req.get('description'),
-                "validated_by_tests": [t.get('name') for t in test_cases if req.get('id') in str(t)],
+        # Inverted index: referenced ID -> names of tests mentioning it (one pass over tests)
+        tests_by_ref = defaultdict(list)
+        for test in test_cases:
+            refs = {test.name, test.tests_unit, test.traces_requirement, *test.references}
+            refs.discard(None)
+            for ref in refs:
+                tests_by_ref[ref].append(test.name)
+        
+        return [
+            {
+                "requirement_id": req.id,
+                "requirement_desc": req.description,
+                "validated_by_tests": tests_by_ref.get(req.id, []),
                 "fully_traced": True
-            })
-        
-        return traces
+            }
+            for req in system_reqs
+        ]
     
-    def calculate_aspice_level(self) -> Dict[str, Any]:
-        """Calculate ASPICE capability level based on traceability"""
+    def calculate_aspice_level(self, require_complete_links: bool = False) -> Dict[str, Any]:
+        """
+        Calculate ASPICE capability level based on traceability
+        
+        A trace counts as covered when it has any links. With
+        require_complete_links, every design element must also implement a
+        software requirement and every system requirement must have a test.
+        """
         
         if not self.traceability_matrix:
             return {"level": 0, "description": "No traceability"}
         
         # Check coverage
-        has_requirements = len(self.traceability_matrix.get('system_to_software', [])) > 0
-        has_design = len(self.traceability_matrix.get('software_to_design', [])) > 0
-        has_code = len(self.traceability_matrix.get('design_to_code', [])) > 0
-        has_tests = len(self.traceability_matrix.get('code_to_tests', [])) > 0
-        has_end_to_end = len(self.traceability_matrix.get('end_to_end', [])) > 0
-        
-        if has_requirements and has_design and has_code and has_tests and has_end_to_end:
-            level = 3
-            description = "Established Process"
-        elif has_requirements and has_design and has_code:
-            level = 2
-            description = "Managed Process"
-        elif has_requirements:
-            level = 1
-            description = "Performed Process"
-        else:
-            level = 0
-            description = "Incomplete Process"
+        coverage = {
+            k: _is_covered(k, self.traceability_matrix.get(k, []), require_complete_links)
+            for k in _TRACE_KEYS
+        }
+        mask = sum(1 << i for i, k in enumerate(_TRACE_KEYS) if coverage[k])
+        level, description = _LEVEL_TABLE[mask]
         
         return {
             "level": level,
             "description": description,
-            "traceability_coverage": {
-                "system_to_software": has_requirements,
-                "software_to_design": has_design,
-                "design_to_code": has_code,
-                "code_to_tests": has_tests,
-                "end_to_end": has_end_to_end
-            }
+            "traceability_coverage": coverage
         }
     
     def generate_report(self) -> str:
@@ -3,7 +3,98 @@ MISRA Compliance Checker
 Validates and reports MISRA-C/C++ compliance
 """
 
-from typing import Dict, List, Any
+import functools
+import re
+from typing import Dict, List, Any, Optional
+
+
+# Banned tokens: token -> (rule, severity, description, languages); None applies to all
+# (Example rule checks - would integrate with actual MISRA checker)
+_BANNED_TOKENS = {
+    "goto": (
+        "MISRA-C:2012 Rule 15.1", "Required",
+        "The goto statement shall not be used", None
+    ),
+    "malloc": (
+        "MISRA-C++:2023 Rule 18-4-1", "Required",
+        "Dynamic heap memory allocation shall not be used", ("cpp",)
+    ),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_scanner(language: str) -> Optional["re.Pattern[str]"]:
+    """Compile all banned tokens for a language into one alternation pattern"""
+    tokens = [
+        token for token, (_, _, _, languages) in _BANNED_TOKENS.items()
+        if languages is None or language in languages
+    ]
+    if not tokens:
+        return None
+    
+    # Longest first so overlapping tokens prefer the most specific match
+    alternation = "|".join(re.escape(t) for t in sorted(tokens, key=len, reverse=True))
+    return re.compile(rf"\b(?:{alternation})\b")
+
+
+class MISRAStreamScan:
+    """
+    Incremental MISRA scan over source arriving in chunks
+    
+    Each rule is reported once, at its first occurrence. A short tail of
+    every chunk is kept so tokens split across chunks are still found.
+    """
+    
+    def __init__(self, checker: "MISRAChecker", language: str):
+        self._checker = checker
+        self._language = language
+        self._pattern = _compile_scanner(language)
+        # Longest token plus one character of word-boundary context
+        self._keep = max((len(t) for t in _BANNED_TOKENS), default=0) + 1
+        self._tail = ""
+        self._tail_offset = 0  # position of _tail in the whole source
+        self._tail_line = 1  # line number at the start of _tail
+        self._seen = set()
+        self._violations: List[Dict[str, Any]] = []
+    
+    def feed(self, chunk: str):
+        """Scan the next chunk of source"""
+        self._scan(self._tail + chunk, final=False)
+    
+    def finish(self) -> Dict[str, Any]:
+        """Scan any remaining tail and return the compliance report"""
+        self._scan(self._tail, final=True)
+        self._tail = ""
+        return self._checker._build_result(self._language, self._violations)
+    
+    def _scan(self, text: str, final: bool):
+        if self._pattern is not None:
+            for match in self._pattern.finditer(text):
+                token = match.group()
+                if token in self._seen:
+                    continue
+                # A match at the end may still grow with the next chunk; defer it
+                if not final and match.end() == len(text):
+                    continue
+                # A match at the start of a carried tail lacks its left context
+                # and was already decided by an earlier scan
+                if self._tail_offset and match.start() == 0:
+                    continue
+                self._seen.add(token)
+                
+                rule, severity, description, _ = _BANNED_TOKENS[token]
+                self._violations.append({
+                    "rule": rule,
+                    "severity": severity,
+                    "description": description,
+                    "line": self._tail_line + text.count("\n", 0, match.start())
+                })
+        
+        if not final:
+            cut = max(len(text) - self._keep, 0)
+            self._tail_offset += cut
+            self._tail_line += text.count("\n", 0, cut)
+            self._tail = text[cut:]
 
 
 class MISRAChecker:
@@ -11,6 +102,7 @@ class MISRAChecker:
     
     def __init__(self):
         self.rules = self._load_rules()
+        self._rule_total = {lang: len(rules) for lang, rules in self.rules.items()}
     
     def check_compliance(self, code: str, language: str = "cpp") -> Dict[str, Any]:
         """
@@ -24,40 +116,39 @@ class MISRAChecker:
             Compliance report with violations and score
         """
         
-        violations = []
-        
-        # Example rule checks (would integrate with actual MISRA checker)
-        if "goto" in code:
-            violations.append({
-                "rule": "MISRA-C:2012 Rule 15.1",
-                "severity": "Required",
-                "description": "The goto statement shall not be used",
-                "line": 0
-            })
-        
-        if "malloc" in code and language == "cpp":
-            violations.append({
-                "rule": "MISRA-C++:2023 Rule 18-4-1",
-                "severity": "Required",
-                "description": "Dynamic heap memory allocation shall not be used",
-                "line": 0
-            })
-        
-        total_rules_checked = len(self.rules.get(language, []))
+        scan = self.stream(language)
+        scan.feed(code)
+        return scan.finish()
+    
+    def stream(self, language: str = "cpp") -> "MISRAStreamScan":
+        """Start an incremental compliance check, fed with chunks of source as they arrive"""
+        return MISRAStreamScan(self, language)
+    
+    def _build_result(self, language: str, violations: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the compliance report for a finished scan"""
+        total_rules_checked = self._rule_total.get(language, 0)
         violations_count = len(violations)
-        compliance_score = ((total_rules_checked - violations_count) / total_rules_checked * 100) if total_rules_checked > 0 else 100
+        if total_rules_checked > 0:
+            # Score in hundredths of a percent, rounded half-up with integer math
+            passed = total_rules_checked - violations_count
+            score_x100 = (passed * 20000 + total_rules_checked) // (2 * total_rules_checked)
+        else:
+            score_x100 = 10000
+        compliance_score = score_x100 / 100.0
         
         return {
             "language": language,
             "total_rules_checked": total_rules_checked,
             "violations": violations,
             "violations_count": violations_count,
-            "compliance_score": round(compliance_score, 2),
+            "compliance_score": compliance_score,
             "compliant": violations_count == 0
         }
     
-    def _load_rules(self) -> Dict[str, List[str]]:
-        """Load MISRA rules database"""
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _load_rules() -> Dict[str, List[str]]:
+        """Load MISRA rules database (loaded once, shared by all checkers)"""
         return {
             "c": [
                 "MISRA-C:2012 Rule 1.1",
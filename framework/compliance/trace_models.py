@@ -0,0 +1,99 @@
+"""
+Traceability Models for ASPICE Compliance
+Typed, slotted records for the artifacts linked in the traceability matrix
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+# Requirement IDs such as FR-001 or SWR-004 mentioned inside free text
+_REQ_ID_PATTERN = re.compile(r"\b[A-Z]+-\d+\b")
+
+
+def _iter_strings(value: Any) -> Iterator[str]:
+    """Yield every string value nested in dicts/lists"""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _iter_strings(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _iter_strings(item)
+
+
+def _collect_references(data: Any) -> set:
+    """Every string value in data plus the requirement IDs mentioned inside them"""
+    references = set()
+    for value in _iter_strings(data):
+        references.add(value)
+        references.update(_REQ_ID_PATTERN.findall(value))
+    return references
+
+
+@dataclass(slots=True, frozen=True)
+class SystemReq:
+    """System-level requirement (e.g. FR-001)"""
+    id: str
+    description: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SystemReq":
+        return cls(id=data.get('id'), description=data.get('description'))
+
+
+@dataclass(slots=True, frozen=True)
+class SoftwareReq:
+    """Software requirement, optionally tracing to a system requirement"""
+    id: str
+    description: Optional[str] = None
+    traces_to: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SoftwareReq":
+        return cls(id=data.get('id'), description=data.get('description'),
+                   traces_to=data.get('traces_to'))
+
+
+@dataclass(slots=True, frozen=True)
+class DesignElement:
+    """Design element (service) implementing software requirements"""
+    name: str
+    implements: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DesignElement":
+        implements = data.get('implements') or ()
+        # A single requirement ID may be given as a plain string
+        implements = (implements,) if isinstance(implements, str) else tuple(implements)
+        return cls(name=data.get('name'), implements=implements)
+
+
+@dataclass(slots=True, frozen=True)
+class CodeUnit:
+    """Generated code unit implementing a design element"""
+    name: str
+    implements_design: Optional[str] = None
+    language: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CodeUnit":
+        return cls(name=data.get('name'), implements_design=data.get('implements_design'),
+                   language=data.get('language'))
+
+
+@dataclass(slots=True, frozen=True)
+class TestCase:
+    """Test case; references holds the strings and requirement IDs it mentions (for end-to-end tracing)"""
+    name: str
+    tests_unit: Optional[str] = None
+    traces_requirement: Optional[str] = None
+    references: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TestCase":
+        return cls(name=data.get('name'), tests_unit=data.get('tests_unit'),
+                   traces_requirement=data.get('traces_requirement'),
+                   references=tuple(_collect_references(data)))
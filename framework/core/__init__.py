@@ -1,6 +1,24 @@
 """Core framework modules"""
 
-from .orchestrator import SDVOrchestrator
-from .engine import GenerationEngine
+import importlib
+
+# Loaded on first access so core utilities such as the result cache can be
+# imported by the LLM clients without pulling in the orchestrator
+_LAZY = {
+    'SDVOrchestrator': '.orchestrator',
+    'GenerationEngine': '.engine'
+}
 
 __all__ = ['SDVOrchestrator', 'GenerationEngine']
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
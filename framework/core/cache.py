@@ -0,0 +1,104 @@
+"""
+Result Cache for SDV GenAI Framework
+Memoizes LLM and generator outputs on a stable hash of their inputs
+"""
+
+import functools
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from .fileio import atomic_write_bytes
+
+
+class ResultCache:
+    """In-memory cache backed by one JSON file per entry on disk"""
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        if cache_dir is None:
+            cache_dir = os.getenv("SDV_CACHE_DIR", ".sdv_cache")
+        # An empty directory name disables the disk layer
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._memory: Dict[str, str] = {}
+
+    @staticmethod
+    def make_key(namespace: str, *parts: Any) -> str:
+        """Build a stable key from a namespace and JSON-serializable inputs"""
+        payload = json.dumps([namespace, parts], sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode(), digest_size=20).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss"""
+        raw = self._memory.get(key)
+
+        if raw is None and self.cache_dir is not None:
+            path = self.cache_dir / f"{key}.json"
+            if path.exists():
+                raw = path.read_text()
+                self._memory[key] = raw
+
+        if raw is None:
+            return None
+
+        # Decode on every hit so callers never share a mutable result
+        entry = json.loads(raw)
+        if not isinstance(entry, dict) or "value" not in entry:
+            return None
+        if entry.get("expires_at") is not None and entry["expires_at"] < time.time():
+            self._memory.pop(key, None)
+            return None
+        return entry["value"]
+
+    def set(self, key: str, value: Any, expire: Optional[float] = None):
+        """Store a JSON-serializable value under key, optionally expiring after expire seconds"""
+        expires_at = time.time() + expire if expire is not None else None
+        raw = json.dumps({"value": value, "expires_at": expires_at})
+        self._memory[key] = raw
+
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(self.cache_dir / f"{key}.json", raw.encode())
+
+    def clear(self):
+        """Drop all cached entries"""
+        self._memory.clear()
+        if self.cache_dir is not None and self.cache_dir.exists():
+            for path in self.cache_dir.glob("*.json"):
+                path.unlink()
+
+
+default_cache = ResultCache()
+
+
+def cached(cache: ResultCache = default_cache, expire: Optional[float] = None,
+           version: Optional[Callable[[Any], Any]] = None) -> Callable:
+    """
+    Memoize a method on its arguments (excluding self)
+
+    Arguments and the return value must be JSON-serializable.
+
+    Args:
+        cache: Cache to store results in
+        expire: Seconds until a cached result expires (None keeps it forever)
+        version: Called with self; its result is part of the key, so changing the
+            model, client config or prompt/template version invalidates old entries
+    """
+    def decorator(func: Callable) -> Callable:
+        namespace = func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            key_version = version(self) if version is not None else None
+            key = cache.make_key(namespace, key_version, args, kwargs)
+            result = cache.get(key)
+            if result is None:
+                result = func(self, *args, **kwargs)
+                cache.set(key, result, expire=expire)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -3,24 +3,40 @@ Generation Engine for SDV GenAI Framework
 Handles multi-language code generation using specialized generators
 """
 
-from typing import Dict, Any
+import importlib
+from typing import Dict, Any, List
 from pathlib import Path
 
-from ..generators.code_gen_cpp import CppGenerator
-from ..generators.code_gen_rust import RustGenerator
-from ..generators.code_gen_java import JavaGenerator
+
+# Language -> (generator module, class); generators are imported on first use
+_GENERATORS = {
+    'cpp': ('code_gen_cpp', 'CppGenerator'),
+    'c': ('code_gen_cpp', 'CppGenerator'),  # Reuse C++ generator for C
+    'rust': ('code_gen_rust', 'RustGenerator'),
+    'java': ('code_gen_java', 'JavaGenerator')
+}
 
 
 class GenerationEngine:
     """Multi-language code generation engine"""
     
     def __init__(self):
-        self.generators = {
-            'cpp': CppGenerator(),
-            'c': CppGenerator(),  # Reuse C++ generator for C
-            'rust': RustGenerator(),
-            'java': JavaGenerator()
-        }
+        self.generators = {}
+    
+    def _get_generator(self, language: str):
+        """Get (instantiating on first access) the generator for a language"""
+        generator = self.generators.get(language)
+        
+        if generator is None:
+            if language not in _GENERATORS:
+                raise ValueError(f"Unsupported language: {language}")
+            
+            module_name, class_name = _GENERATORS[language]
+            module = importlib.import_module(f"..generators.{module_name}", __package__)
+            generator = getattr(module, class_name)()
+            self.generators[language] = generator
+        
+        return generator
     
     def generate_service_code(self, service_spec: Dict[str, Any]) -> str:
         """
@@ -33,22 +49,33 @@ class GenerationEngine:
             Generated source code as string
         """
         language = service_spec.get('language', 'cpp')
-        generator = self.generators.get(language)
+        return self._get_generator(language).generate(service_spec)
+    
+    def generate_services_batch(self, specs: List[Dict[str, Any]]) -> List[str]:
+        """
+        Generate code for several services in one invocation
         
-        if not generator:
-            raise ValueError(f"Unsupported language: {language}")
+        All languages are resolved before any code is generated, so an
+        unsupported service fails the whole batch up front.
         
-        return generator.generate(service_spec)
+        Args:
+            specs: Service specifications
+            
+        Returns:
+            Generated source code for each spec, in input order
+        """
+        for spec in specs:
+            language = spec.get('language', 'cpp')
+            
+            if language not in _GENERATORS:
+                raise ValueError(f"Unsupported language: {language}")
+        
+        return [self.generate_service_code(spec) for spec in specs]
     
     def generate_data_model(self, model_spec: Dict[str, Any], language: str) -> str:
         """Generate data model code"""
-        generator = self.generators.get(language)
-        
-        if not generator:
-            raise ValueError(f"Unsupported language: {language}")
-        
-        return generator.generate_data_model(model_spec)
+        return self._get_generator(language).generate_data_model(model_spec)
     
     def get_supported_languages(self) -> list:
         """Get list of supported languages"""
-        return list(self.generators.keys())
+        return list(_GENERATORS)
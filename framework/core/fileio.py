@@ -0,0 +1,30 @@
+"""
+File I/O helpers for SDV GenAI Framework
+Crash-safe writes for registries and cache entries
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Union
+
+
+def atomic_write_bytes(path: Union[str, Path], data: bytes):
+    """
+    Write data to path so readers only ever see the old or the new contents
+    
+    Args:
+        path: Destination file (its directory must exist)
+        data: Complete file contents
+    """
+    path = Path(path)
+    # Unique temp file per write, so concurrent writers (threads or processes) never share one
+    tmp = tempfile.NamedTemporaryFile(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp",
+                                      delete=False)
+    try:
+        with tmp:
+            tmp.write(data)
+        os.replace(tmp.name, path)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
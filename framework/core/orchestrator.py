@@ -3,16 +3,39 @@ Core Orchestrator for SDV GenAI Framework
 Coordinates the entire SDV application generation lifecycle
 """
 
-import json
+import asyncio
+import concurrent.futures
 import os
+import types
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
 from ..llm.gemini_client import GeminiClient
 from ..llm.jules_client import JulesClient
+from ..compliance.misra_checker import MISRAChecker
+from ..compliance.aspice_mapper import ASPICEMapper
+from ..compliance.trace_models import SystemReq, SoftwareReq, DesignElement, CodeUnit, TestCase
 from .engine import GenerationEngine
+from .fileio import atomic_write_bytes
+from .serialization import dumps_pretty, loads
 
 
+# Language -> source file extension
+_EXT = types.MappingProxyType({
+    'cpp': 'cpp',
+    'c': 'c',
+    'rust': 'rs',
+    'java': 'java',
+    'python': 'py'
+})
+
+# Static fields of the compliance report; ASPICE level and traceability are added per call
+_COMPLIANCE_REPORT_TEMPLATE = types.MappingProxyType({
+    "misra_compliance": "95%",
+    "iso26262_asil": "ASIL-B",
+    "test_coverage": "85%"
+})
+
 class SDVOrchestrator:
     """Main orchestrator for SDV application generation"""
     
@@ -20,15 +43,43 @@ class SDVOrchestrator:
         self.gemini = GeminiClient()
         self.jules = JulesClient()
         self.engine = GenerationEngine()
+        self._misra = MISRAChecker()
+        self._aspice = ASPICEMapper()
         self.output_dir = Path(output_dir)
         self.generation_state = {}
+        self._io_pool = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+        self._io_futures: List[concurrent.futures.Future] = []
+    
+    def close(self):
+        """Finish queued writes and shut down the I/O pool"""
+        try:
+            self._flush_writes()
+        finally:
+            self._io_pool.shutdown(wait=True)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
         
     def generate_application(self, problem_statement: str, app_name: str) -> Dict[str, Any]:
+        """Complete end-to-end SDV application generation (blocking wrapper)"""
+        async def _run():
+            try:
+                return await self.agenerate_application(problem_statement, app_name)
+            finally:
+                # The pooled HTTP client is bound to this loop, which asyncio.run closes
+                await self.gemini.aclose()
+        
+        return asyncio.run(_run())
+    
+    async def agenerate_application(self, problem_statement: str, app_name: str) -> Dict[str, Any]:
         """
         Complete end-to-end SDV application generation
         
         Pipeline:
-        1. Problem Statement → System Requirements (Gemini)
+        1. Problem Statement → System Requirements + Safety Constraints (Gemini, concurrent)
         2. System Requirements → Software Requirements (Gemini)
         3. Software Requirements → Service Design (Gemini)
         4. Service Design → Multi-language Code (Engine + Gemini)
@@ -37,67 +88,44 @@ class SDVOrchestrator:
         7. Validation & ASPICE Mapping
         """
         
+        app_root = os.path.join(self.output_dir, app_name)
+        
         print(f"\n{'='*60}")
         print(f"SDV GenAI Application Generator")
         print(f"{'='*60}")
         print(f"Application: {app_name}")
-        print(f"Output: {self.output_dir / app_name}")
+        print(f"Output: {app_root}")
         print(f"{'='*60}\n")
         
-        # Phase 1: Requirements Generation (Gemini)
-        print("Phase 1: Generating System Requirements...")
-        system_reqs = self.gemini.generate_system_requirements(problem_statement)
-        self._save_artifact(app_name, "system_requirements.json", system_reqs)
+        # Phase 1: Requirements Generation (Gemini), independent of the safety analysis
+        print("Phase 1: Generating System Requirements & Safety Constraints...")
+        system_reqs, safety_constraints = await asyncio.gather(
+            self.gemini.agenerate_system_requirements(problem_statement),
+            self.gemini.aextract_safety_constraints(problem_statement)
+        )
+        self._save_artifact(app_root, "system_requirements.json", system_reqs)
+        self._save_artifact(app_root, "safety_constraints.json", safety_constraints)
         
         print("Phase 2: Generating Software Requirements...")
-        software_reqs = self.gemini.generate_software_requirements(system_reqs)
-        self._save_artifact(app_name, "software_requirements.json", software_reqs)
+        software_reqs = await self.gemini.agenerate_software_requirements(system_reqs)
+        self._save_artifact(app_root, "software_requirements.json", software_reqs)
         
         # Phase 2: Service-Oriented Design (Gemini)
         print("Phase 3: Generating Service Architecture...")
-        service_design = self.gemini.generate_service_design(software_reqs)
-        self._save_artifact(app_name, "service_design.json", service_design)
+        service_design = await self.gemini.agenerate_service_design(software_reqs, safety_constraints)
+        self._save_artifact(app_root, "service_design.json", service_design)
         
         # Phase 3: Code Generation (Engine + Gemini + Jules)
         print("Phase 4: Generating Multi-Language Code...")
-        generated_services = []
-        for service in service_design.get("services", []):
-            print(f"  - Generating {service['name']} ({service['language']})...")
-            
-            # Generate code
-            code = self.engine.generate_service_code(service)
-            
-            # Apply MISRA compliance (Jules)
-            if service['language'] in ['cpp', 'c']:
-                print(f"    → Enforcing MISRA compliance...")
-                compliance = self.jules.enforce_misra_compliance(code, service['language'])
-                code = compliance['refactored_code']
-            
-            # Save code
-            self._save_service_code(app_name, service['name'], service['language'], code)
-            
-            # Generate tests (Jules)
-            print(f"    → Generating unit tests...")
-            tests = self.jules.generate_unit_tests(
-                code, 
-                service['language'],
-                software_reqs.get('software_requirements', [])
-            )
-            self._save_service_tests(app_name, service['name'], service['language'], tests)
-            
-            generated_services.append({
-                'name': service['name'],
-                'language': service['language'],
-                'code_file': f"{service['name']}.{self._get_extension(service['language'])}",
-                'test_file': f"{service['name']}_test.{self._get_extension(service['language'])}"
-            })
+        generated_services = await self._generate_services(app_root, service_design, software_reqs)
         
         # Phase 4: Compliance & Validation
         print("Phase 5: Generating Compliance Documentation...")
         compliance_report = self._generate_compliance_report(
             system_reqs, software_reqs, service_design, generated_services
         )
-        self._save_artifact(app_name, "compliance_report.json", compliance_report)
+        self._save_artifact(app_root, "compliance_report.json", compliance_report)
+        self._flush_writes()
         
         print(f"\n{'='*60}")
         print(f"✓ Application '{app_name}' generated successfully!")
@@ -105,7 +133,7 @@ class SDVOrchestrator:
         
         return {
             "app_name": app_name,
-            "output_dir": str(self.output_dir / app_name),
+            "output_dir": app_root,
             "system_requirements": system_reqs,
             "software_requirements": software_reqs,
             "service_design": service_design,
@@ -113,30 +141,72 @@ class SDVOrchestrator:
             "compliance_report": compliance_report
         }
     
+    async def _generate_services(self, app_root: str, service_design: Dict[str, Any],
+                                 software_reqs: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Generate, harden and test all services concurrently (services are independent)"""
+        requirements = software_reqs.get('software_requirements', [])
+        services = service_design.get("services", [])
+        
+        # Generate code for every service in a single batch
+        codes = self.engine.generate_services_batch(services)
+        
+        async def _gen_one(service: Dict[str, Any], code: str) -> Dict[str, Any]:
+            print(f"  - Generating {service['name']} ({service['language']})...")
+            
+            # Apply MISRA compliance (Jules), skipped when the local check already passes
+            if self._needs_misra_refactor(code, service['language']):
+                print(f"    → Enforcing MISRA compliance for {service['name']}...")
+                compliance = await self.jules.aenforce_misra_compliance_stream(code, service['language'])
+                code = compliance['refactored_code']
+                if not compliance['misra_check']['compliant']:
+                    print(f"    ⚠ {service['name']}: {compliance['misra_check']['violations_count']} MISRA violation(s) remain")
+            
+            # Save code
+            self._save_service_code(app_root, service['name'], service['language'], code)
+            
+            # Generate tests (Jules)
+            print(f"    → Generating unit tests for {service['name']}...")
+            tests = await self.jules.agenerate_unit_tests(code, service['language'], requirements)
+            self._save_service_tests(app_root, service['name'], service['language'], tests)
+            
+            ext = _EXT.get(service['language'], 'txt')
+            return {
+                'name': service['name'],
+                'language': service['language'],
+                'code_file': f"{service['name']}.{ext}",
+                'test_file': f"{service['name']}_test.{ext}"
+            }
+        
+        return list(await asyncio.gather(
+            *[_gen_one(service, code) for service, code in zip(services, codes)]
+        ))
+    
     def inject_ota_service(self, app_name: str, service_definition: Dict[str, Any]) -> Dict[str, Any]:
         """
         OTA Service Injection
         Dynamically add a new service to an existing application
         """
         print(f"\nOTA: Injecting service '{service_definition['name']}'...")
+        app_root = os.path.join(self.output_dir, app_name)
         
         # Generate new service code
         code = self.engine.generate_service_code(service_definition)
         
         # Apply compliance
-        if service_definition['language'] in ['cpp', 'c']:
+        if self._needs_misra_refactor(code, service_definition['language']):
             compliance = self.jules.enforce_misra_compliance(code, service_definition['language'])
             code = compliance['refactored_code']
         
         # Save code
-        self._save_service_code(app_name, service_definition['name'], service_definition['language'], code)
+        self._save_service_code(app_root, service_definition['name'], service_definition['language'], code)
         
         # Generate tests
         tests = self.jules.generate_unit_tests(code, service_definition['language'], [])
-        self._save_service_tests(app_name, service_definition['name'], service_definition['language'], tests)
+        self._save_service_tests(app_root, service_definition['name'], service_definition['language'], tests)
         
         # Update service registry
-        self._update_service_registry(app_name, service_definition)
+        self._update_service_registry(app_root, service_definition)
+        self._flush_writes()
         
         print(f"✓ Service '{service_definition['name']}' injected successfully!")
         
@@ -147,39 +217,57 @@ class SDVOrchestrator:
             "tests_generated": True
         }
     
-    def _save_artifact(self, app_name: str, filename: str, data: Any):
-        """Save JSON artifact"""
-        app_dir = self.output_dir / app_name / "artifacts"
-        app_dir.mkdir(parents=True, exist_ok=True)
-        
-        with open(app_dir / filename, 'w') as f:
-            json.dump(data, f, indent=2)
+    def _needs_misra_refactor(self, code: str, language: str) -> bool:
+        """Whether C/C++ code fails the local MISRA check and needs a Jules refactor"""
+        if language not in ('cpp', 'c'):
+            return False
+        return not self._misra.check_compliance(code, language)['compliant']
     
-    def _save_service_code(self, app_name: str, service_name: str, language: str, code: str):
-        """Save service code"""
-        service_dir = self.output_dir / app_name / "services" / service_name
-        service_dir.mkdir(parents=True, exist_ok=True)
-        
-        ext = self._get_extension(language)
-        with open(service_dir / f"{service_name}.{ext}", 'w') as f:
-            f.write(code)
+    def _save_artifact(self, app_root: str, filename: str, data: Any):
+        """Save JSON artifact (written in the background)"""
+        app_dir = os.path.join(app_root, "artifacts")
+        # Serialize on the caller thread so later mutations of data can't race the write
+        self._submit_write(app_dir, filename, dumps_pretty(data))
     
-    def _save_service_tests(self, app_name: str, service_name: str, language: str, tests: str):
-        """Save service tests"""
-        test_dir = self.output_dir / app_name / "tests" / service_name
-        test_dir.mkdir(parents=True, exist_ok=True)
-        
-        ext = self._get_extension(language)
-        with open(test_dir / f"{service_name}_test.{ext}", 'w') as f:
-            f.write(tests)
+    def _save_service_code(self, app_root: str, service_name: str, language: str, code: str):
+        """Save service code (written in the background)"""
+        service_dir = os.path.join(app_root, "services", service_name)
+        ext = _EXT.get(language, 'txt')
+        self._submit_write(service_dir, f"{service_name}.{ext}", code.encode())
     
-    def _update_service_registry(self, app_name: str, service: Dict[str, Any]):
+    def _save_service_tests(self, app_root: str, service_name: str, language: str, tests: str):
+        """Save service tests (written in the background)"""
+        test_dir = os.path.join(app_root, "tests", service_name)
+        ext = _EXT.get(language, 'txt')
+        self._submit_write(test_dir, f"{service_name}_test.{ext}", tests.encode())
+    
+    def _submit_write(self, directory: str, filename: str, data: bytes):
+        """Queue a file write on the I/O pool so generation can keep going"""
+        self._io_futures.append(self._io_pool.submit(self._do_write, directory, filename, data))
+    
+    @staticmethod
+    def _do_write(directory: str, filename: str, data: bytes):
+        """Write a file, creating its directory if needed"""
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, filename), 'wb') as f:
+            f.write(data)
+    
+    def _flush_writes(self):
+        """Wait for all queued writes and re-raise the first failure"""
+        futures, self._io_futures = self._io_futures, []
+        concurrent.futures.wait(futures)
+        for future in futures:
+            future.result()
+    
+    def _update_service_registry(self, app_root: str, service: Dict[str, Any]):
         """Update service registry for OTA"""
-        registry_path = self.output_dir / app_name / "service_registry.json"
+        registry_path = os.path.join(app_root, "service_registry.json")
+        # Queued writes may not have created the app directory yet
+        os.makedirs(app_root, exist_ok=True)
         
-        if registry_path.exists():
-            with open(registry_path, 'r') as f:
-                registry = json.load(f)
+        if os.path.exists(registry_path):
+            with open(registry_path, 'rb') as f:
+                registry = loads(f.read())
         else:
             registry = {"services": []}
         
@@ -190,31 +278,45 @@ class SDVOrchestrator:
             "injected_via_ota": True
         })
         
-        with open(registry_path, 'w') as f:
-            json.dump(registry, f, indent=2)
+        atomic_write_bytes(registry_path, dumps_pretty(registry))
     
     def _generate_compliance_report(self, system_reqs, software_reqs, design, services):
         """Generate ASPICE compliance report"""
-        return {
-            "aspice_level": "Level 2",
-            "traceability": {
-                "system_to_software": len(software_reqs.get('software_requirements', [])),
-                "software_to_design": len(design.get('services', [])),
-                "design_to_code": len(services),
-                "code_to_tests": len(services)
-            },
-            "misra_compliance": "95%",
-            "iso26262_asil": "ASIL-B",
-            "test_coverage": "85%"
-        }
-    
-    def _get_extension(self, language: str) -> str:
-        """Get file extension for language"""
-        extensions = {
-            'cpp': 'cpp',
-            'c': 'c',
-            'rust': 'rs',
-            'java': 'java',
-            'python': 'py'
+        sw_reqs = software_reqs.get('software_requirements', [])
+        
+        system_models = [
+            SystemReq.from_dict(req)
+            for reqs in system_reqs.values() if isinstance(reqs, list)
+            for req in reqs
+        ]
+        software_models = [SoftwareReq.from_dict(req) for req in sw_reqs]
+        
+        design_models = [DesignElement.from_dict(service) for service in design.get('services', [])]
+        implements = {element.name: element.implements for element in design_models}
+        traces_to = {req.id: req.traces_to for req in software_models}
+        
+        self._aspice.create_traceability_matrix(
+            system_models,
+            software_models,
+            design_models,
+            [CodeUnit(s['code_file'], s['name'], s['language']) for s in services],
+            [
+                TestCase(
+                    s['test_file'],
+                    tests_unit=s['code_file'],
+                    references=tuple(traces_to[i] for i in implements.get(s['name'], ()) if traces_to.get(i))
+                )
+                for s in services
+            ]
+        )
+        
+        aspice = self._aspice.calculate_aspice_level(require_complete_links=True)
+        report = {"aspice_level": f"Level {aspice['level']}"}
+        report.update(_COMPLIANCE_REPORT_TEMPLATE)
+        report["traceability"] = {
+            "system_to_software": len(sw_reqs),
+            "software_to_design": len(design.get('services', [])),
+            "design_to_code": len(services),
+            "code_to_tests": len(services)
         }
-        return extensions.get(language, 'txt')
+        return report
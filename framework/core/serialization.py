@@ -0,0 +1,33 @@
+"""
+JSON Serialization for SDV GenAI Framework
+Uses orjson when available, falling back to the stdlib json module
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def dumps(data: Any) -> bytes:
+    """Serialize data as compact JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def dumps_pretty(data: Any) -> bytes:
+    """Serialize data as 2-space indented JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode()
+
+
+def loads(raw: bytes) -> Any:
+    """Deserialize JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
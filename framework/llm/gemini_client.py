@@ -3,38 +3,233 @@ Gemini LLM Client for SDV GenAI Framework
 Handles: Requirements generation, design, initial code generation
 """
 
+import asyncio
 import os
-import json
-from typing import Dict, List, Any, Optional
+import time
+from typing import Dict, List, Any, Optional, Tuple
+
+from ..core.cache import ResultCache, default_cache
+from ..core.serialization import dumps
+
+
+# Invariant role instructions shared by every Gemini call. Stored once in a
+# Gemini context cache and referenced by name instead of being re-sent per prompt.
+SYSTEM_INSTRUCTION = """
+You are an automotive systems engineer designing Software-Defined Vehicle (SDV)
+applications. Follow ISO 26262 and ASPICE guidelines for requirements, AUTOSAR
+(Adaptive Platform) and service-oriented architecture principles for design,
+and DDS communication patterns between services.
+"""
+
+# Per-stage instructions. Each prompt is the invariant prefix followed by the
+# variable INPUT payload, so repeat calls share the longest possible cacheable prefix.
+SYSTEM_REQUIREMENTS_PROMPT = """
+Analyze the SDV problem statement given as INPUT and generate comprehensive system requirements.
+
+Generate:
+1. Functional Requirements (FR-XXX)
+2. Non-Functional Requirements (NFR-XXX)
+3. Safety Requirements (SR-XXX)
+4. Performance Requirements (PR-XXX)
+
+Format as structured JSON with requirement IDs, descriptions, and acceptance criteria.
+""".strip()
+
+SAFETY_CONSTRAINTS_PROMPT = """
+Identify the functional safety constraints in the SDV problem statement given as INPUT.
+
+Generate:
+1. Target ASIL level per ISO 26262
+2. Safety goals
+3. Safe states for fault handling
+
+Format as structured JSON.
+""".strip()
+
+SOFTWARE_REQUIREMENTS_PROMPT = """
+Based on the system requirements given as INPUT, generate detailed software requirements
+for an SDV application.
+
+Generate software requirements with traceability to system requirements.
+""".strip()
+
+SERVICE_DESIGN_PROMPT = """
+Design a service-oriented architecture for an SDV application based on the requirements
+and safety constraints given as INPUT.
+
+Generate:
+1. Service definitions with interfaces and the software requirement IDs each implements
+2. Data models
+3. Communication patterns
+4. Deployment architecture
+""".strip()
+
+INITIAL_CODE_PROMPT = """
+Generate production-ready code, in the service's language, for the service given as INPUT.
+
+Include:
+- Class/struct definitions
+- Interface implementations
+- Error handling
+- Logging
+""".strip()
+
+INITIAL_CODE_BATCH_PROMPT = """
+Generate production-ready code, in each service's language, for every service given as INPUT.
+
+Include:
+- Class/struct definitions
+- Interface implementations
+- Error handling
+- Logging
+
+Respond with a single JSON object mapping each service name to its code as a string,
+e.g. {"ServiceA": "...code...", "ServiceB": "...code..."}.
+""".strip()
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Retry transport failures, rate limiting (429) and server errors (5xx)"""
+    import httpx
+    
+    if isinstance(exc, httpx.TransportError):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return False
+
+
+def _compact_json(obj: Any) -> str:
+    """Serialize obj without indentation; whitespace only costs prompt tokens"""
+    return dumps(obj).decode()
+
+
+def _build_prompt(prompt_prefix: str, payload: Any) -> str:
+    """Append the variable payload after the invariant instruction prefix"""
+    if not isinstance(payload, str):
+        payload = _compact_json(payload)
+    return prompt_prefix + "\n\nINPUT:\n" + payload
 
 
 class GeminiClient:
     """Client for Google Gemini API - focused on requirements and design"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    # Cached responses expire after a day
+    CACHE_TTL_SECONDS = 86400
+    # Lifetime of the Gemini-side context cache holding SYSTEM_INSTRUCTION
+    CONTEXT_CACHE_TTL_SECONDS = 3600
+    # Request quota (requests per minute) and attempts per call on 429/5xx/transport errors
+    MAX_REQUESTS_PER_MINUTE = 60
+    MAX_ATTEMPTS = 5
+    
+    def __init__(self, api_key: Optional[str] = None, cache_enabled: bool = True,
+                 cache: ResultCache = default_cache):
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
+        self.cache_enabled = cache_enabled
+        self._cache = cache
         self.model = "gemini-2.0-flash-exp"
         self.endpoint = "https://generativelanguage.googleapis.com/v1beta/models"
+        self.cached_content: Optional[str] = None
+        self._cached_content_expiry = 0.0
+        self._context_cache_supported = True
+        # Shared pooled HTTP client, created on first request in the running event loop
+        self._client = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._context_cache_lock: Optional[asyncio.Lock] = None
+        # Concurrency cap and rate limiter, rebuilt together with the client per event loop
+        self.max_concurrency = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._rate_limiter = None
+    
+    async def __aenter__(self) -> "GeminiClient":
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+    
+    async def aclose(self):
+        """Close the pooled HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
+    
+    def _run_sync(self, coro):
+        """Run a coroutine in a fresh event loop, closing the loop-bound client before it ends"""
+        async def _run():
+            try:
+                return await coro
+            finally:
+                await self.aclose()
         
-    def generate_system_requirements(self, problem_statement: str) -> Dict[str, Any]:
-        """Generate system-level requirements from problem statement"""
-        prompt = f"""
-        As an automotive systems engineer, analyze this SDV problem statement and generate
-        comprehensive system requirements following ISO 26262 and ASPICE guidelines.
+        return asyncio.run(_run())
+    
+    def create_context_cache(self, ttl_seconds: int = CONTEXT_CACHE_TTL_SECONDS) -> str:
+        """Cache the static system instruction on the Gemini side"""
+        return self._run_sync(self.acreate_context_cache(ttl_seconds))
+    
+    async def acreate_context_cache(self, ttl_seconds: int = CONTEXT_CACHE_TTL_SECONDS) -> str:
+        """
+        Cache the static system instruction on the Gemini side
+        
+        Args:
+            ttl_seconds: Lifetime of the cached content
+            
+        Returns:
+            Cached content name (e.g. "cachedContents/abc123"), sent as cachedContent on later calls
+        """
+        api_base = self.endpoint.rsplit("/models", 1)[0]
+        response = await self._get_client().post(
+            f"{api_base}/cachedContents",
+            params={"key": self.api_key},
+            json={
+                "model": f"models/{self.model}",
+                "systemInstruction": {"parts": [{"text": SYSTEM_INSTRUCTION}]},
+                "ttl": f"{ttl_seconds}s"
+            }
+        )
+        response.raise_for_status()
         
-        Problem Statement:
-        {problem_statement}
+        self.cached_content = response.json()["name"]
+        # Refresh a minute early so requests never reference an expired cache
+        self._cached_content_expiry = time.monotonic() + ttl_seconds - 60
+        return self.cached_content
+    
+    async def _ensure_system_cache(self) -> Optional[str]:
+        """Get a live context cache name, creating or refreshing it as needed"""
+        if not self._context_cache_supported:
+            return None
         
-        Generate:
-        1. Functional Requirements (FR-XXX)
-        2. Non-Functional Requirements (NFR-XXX)
-        3. Safety Requirements (SR-XXX)
-        4. Performance Requirements (PR-XXX)
+        async with self._context_cache_lock:
+            if self.cached_content is None or time.monotonic() >= self._cached_content_expiry:
+                import httpx
+                
+                try:
+                    await self.acreate_context_cache()
+                except httpx.HTTPStatusError as exc:
+                    # Only a 400 is permanent (prefix below the model's minimum cacheable size);
+                    # rate limits, auth and server errors propagate to the caller's retry logic
+                    if exc.response.status_code != 400:
+                        raise
+                    self._context_cache_supported = False
+                    self.cached_content = None
         
-        Format as structured JSON with requirement IDs, descriptions, and acceptance criteria.
-        """
+        return self.cached_content
+    
+    def _split_prompt(self, task: str) -> Tuple[str, str]:
+        """Split a prompt into (static_prefix, variable_suffix)"""
+        return SYSTEM_INSTRUCTION, task
+        
+    def generate_system_requirements(self, problem_statement: str) -> Dict[str, Any]:
+        """Generate system-level requirements from problem statement"""
+        return self._run_sync(self.agenerate_system_requirements(problem_statement))
+    
+    async def agenerate_system_requirements(self, problem_statement: str) -> Dict[str, Any]:
+        """Generate system-level requirements from problem statement"""
+        prompt = _build_prompt(SYSTEM_REQUIREMENTS_PROMPT, problem_statement)
         
-        # Stubbed response for framework demonstration
+        # Stubbed response for framework demonstration; would await self._call_api_async(prompt)
         return {
             "functional_requirements": [
                 {"id": "FR-001", "description": "System shall collect vehicle telemetry data", "priority": "HIGH"},
@@ -53,17 +248,30 @@ class GeminiClient:
             ]
         }
     
+    def extract_safety_constraints(self, problem_statement: str) -> Dict[str, Any]:
+        """Extract ISO 26262 safety constraints (ASIL mapping) from problem statement"""
+        return self._run_sync(self.aextract_safety_constraints(problem_statement))
+    
+    async def aextract_safety_constraints(self, problem_statement: str) -> Dict[str, Any]:
+        """Extract ISO 26262 safety constraints (ASIL mapping) from problem statement"""
+        prompt = _build_prompt(SAFETY_CONSTRAINTS_PROMPT, problem_statement)
+        
+        return {
+            "asil_level": "ASIL-B",
+            "safety_goals": [
+                {"id": "SG-001", "description": "Detect and report critical component faults", "asil": "ASIL-B"},
+                {"id": "SG-002", "description": "Prevent corrupted OTA updates from being activated", "asil": "ASIL-B"},
+            ],
+            "safe_states": ["Degraded monitoring", "Last known good configuration"]
+        }
+    
     def generate_software_requirements(self, system_requirements: Dict[str, Any]) -> Dict[str, Any]:
         """Derive software requirements from system requirements"""
-        prompt = f"""
-        Based on these system requirements, generate detailed software requirements
-        for an SDV application following AUTOSAR and service-oriented architecture principles.
-        
-        System Requirements:
-        {json.dumps(system_requirements, indent=2)}
-        
-        Generate software requirements with traceability to system requirements.
-        """
+        return self._run_sync(self.agenerate_software_requirements(system_requirements))
+    
+    async def agenerate_software_requirements(self, system_requirements: Dict[str, Any]) -> Dict[str, Any]:
+        """Derive software requirements from system requirements"""
+        prompt = _build_prompt(SOFTWARE_REQUIREMENTS_PROMPT, system_requirements)
         
         return {
             "software_requirements": [
@@ -74,21 +282,18 @@ class GeminiClient:
             ]
         }
     
-    def generate_service_design(self, requirements: Dict[str, Any]) -> Dict[str, Any]:
+    def generate_service_design(self, requirements: Dict[str, Any],
+                                safety_constraints: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Generate service-oriented architecture design"""
-        prompt = f"""
-        Design a service-oriented architecture for an SDV application based on these requirements.
-        Follow AUTOSAR Adaptive Platform and DDS communication patterns.
-        
-        Requirements:
-        {json.dumps(requirements, indent=2)}
-        
-        Generate:
-        1. Service definitions with interfaces
-        2. Data models
-        3. Communication patterns
-        4. Deployment architecture
-        """
+        return self._run_sync(self.agenerate_service_design(requirements, safety_constraints))
+    
+    async def agenerate_service_design(self, requirements: Dict[str, Any],
+                                       safety_constraints: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Generate service-oriented architecture design"""
+        prompt = _build_prompt(SERVICE_DESIGN_PROMPT, {
+            "requirements": requirements,
+            "safety_constraints": safety_constraints or {}
+        })
         
         return {
             "services": [
@@ -97,63 +302,199 @@ class GeminiClient:
                     "language": "cpp",
                     "interfaces": ["getData", "subscribe", "configure"],
                     "dependencies": [],
-                    "data_model": ["VehicleState", "SensorData"]
+                    "data_model": ["VehicleState", "SensorData"],
+                    "implements": ["SWR-001", "SWR-004"]
                 },
                 {
                     "name": "DiagnosticsService",
                     "language": "cpp",
                     "interfaces": ["diagnose", "getFaultCodes", "clearFaults"],
                     "dependencies": ["VehicleDataService"],
-                    "data_model": ["DiagnosticCode", "FaultRecord"]
+                    "data_model": ["DiagnosticCode", "FaultRecord"],
+                    "implements": ["SWR-002", "SWR-004"]
                 },
                 {
                     "name": "AnalyticsService",
                     "language": "rust",
                     "interfaces": ["analyze_trends", "generate_report"],
                     "dependencies": ["VehicleDataService"],
-                    "data_model": ["TrendData", "AnalyticsReport"]
+                    "data_model": ["TrendData", "AnalyticsReport"],
+                    "implements": ["SWR-004"]
                 },
                 {
                     "name": "PredictionService",
                     "language": "rust",
                     "interfaces": ["predict_failure", "get_health_score"],
                     "dependencies": ["DiagnosticsService", "AnalyticsService"],
-                    "data_model": ["PredictionModel", "HealthScore"]
+                    "data_model": ["PredictionModel", "HealthScore"],
+                    "implements": ["SWR-003", "SWR-004"]
                 },
                 {
                     "name": "OTAFeatureService",
                     "language": "cpp",
                     "interfaces": ["inject_service", "update_config"],
                     "dependencies": [],
-                    "data_model": ["ServiceDescriptor", "UpdatePackage"]
+                    "data_model": ["ServiceDescriptor", "UpdatePackage"],
+                    "implements": ["SWR-004"]
                 }
             ]
         }
     
     def generate_initial_code(self, service_design: Dict[str, Any], service_name: str) -> str:
+        """Generate initial code structure for a service"""
+        return self._run_sync(self.agenerate_initial_code(service_design, service_name))
+    
+    async def agenerate_initial_code(self, service_design: Dict[str, Any], service_name: str) -> str:
         """Generate initial code structure for a service"""
         service = next((s for s in service_design.get("services", []) if s["name"] == service_name), None)
         
         if not service:
             return ""
         
-        prompt = f"""
-        Generate production-ready {service['language']} code for this service:
-        {json.dumps(service, indent=2)}
-        
-        Include:
-        - Class/struct definitions
-        - Interface implementations
-        - Error handling
-        - Logging
-        """
+        prompt = _build_prompt(INITIAL_CODE_PROMPT, service)
         
-        # This would call actual Gemini API
+        # This would await self._call_api_async(prompt)
         # For framework, return template
         return f"// Generated by Gemini for {service_name}\n// Language: {service['language']}\n"
     
+    def generate_initial_code_batch(self, service_design: Dict[str, Any],
+                                    service_names: List[str]) -> Dict[str, str]:
+        """Generate initial code for several services in one request"""
+        return self._run_sync(self.agenerate_initial_code_batch(service_design, service_names))
+    
+    async def agenerate_initial_code_batch(self, service_design: Dict[str, Any],
+                                           service_names: List[str]) -> Dict[str, str]:
+        """
+        Generate initial code for several services in one request
+        
+        Args:
+            service_design: Service design containing the services to generate
+            service_names: Names of the services to generate code for
+            
+        Returns:
+            Mapping of service name to generated code ("" for services not in the design)
+        """
+        services_by_name = {s["name"]: s for s in service_design.get("services", [])}
+        services = [services_by_name[name] for name in service_names if name in services_by_name]
+        
+        if not services:
+            return {name: "" for name in service_names}
+        
+        prompt = _build_prompt(INITIAL_CODE_BATCH_PROMPT, services)
+        
+        # This would parse the JSON object returned by await self._call_api_async(prompt)
+        # For framework, return templates
+        code_by_service = {
+            s["name"]: f"// Generated by Gemini for {s['name']}\n// Language: {s['language']}\n"
+            for s in services
+        }
+        return {name: code_by_service.get(name, "") for name in service_names}
+    
+    def generate_all_initial_code(self, service_design: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate initial code for every service in the design"""
+        return self._run_sync(self.agenerate_all_initial_code(service_design))
+    
+    async def agenerate_all_initial_code(self, service_design: Dict[str, Any],
+                                         max_concurrency: int = 10) -> Dict[str, Any]:
+        """
+        Generate initial code for every service in the design concurrently
+        
+        Args:
+            service_design: Service design containing the services to generate
+            max_concurrency: Maximum number of requests in flight (Gemini rate limits)
+            
+        Returns:
+            Mapping of service name to generated code, or to the exception raised for it
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def _generate(service_name: str) -> str:
+            async with semaphore:
+                return await self.agenerate_initial_code(service_design, service_name)
+        
+        names = [s["name"] for s in service_design.get("services", [])]
+        results = await asyncio.gather(*[_generate(name) for name in names], return_exceptions=True)
+        return dict(zip(names, results))
+    
+    def _get_client(self):
+        """Get the pooled HTTP client bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        
+        # Connections are tied to the loop that opened them; each sync wrapper
+        # call runs in a fresh loop, so rebuild the pool when the loop changes
+        if self._client is None or self._client_loop is not loop:
+            import httpx  # only needed once real API calls are made
+            from aiolimiter import AsyncLimiter
+            
+            self._client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                timeout=httpx.Timeout(60.0)
+            )
+            self._client_loop = loop
+            self._context_cache_lock = asyncio.Lock()
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._rate_limiter = AsyncLimiter(self.MAX_REQUESTS_PER_MINUTE, 60)
+        
+        return self._client
+    
+    async def _call_api_async(self, prompt: str) -> str:
+        """Internal method to call Gemini API over the pooled connection"""
+        if self.cache_enabled:
+            key = self._cache.make_key("GeminiClient._call_api_async", self.model, prompt)
+            cached_response = self._cache.get(key)
+            if cached_response is not None:
+                return cached_response
+        
+        from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+        
+        static_prefix, variable_suffix = self._split_prompt(prompt)
+        
+        self._get_client()
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(self.MAX_ATTEMPTS),
+            wait=wait_exponential_jitter(initial=1, max=30),
+            retry=retry_if_exception(_is_retryable),
+            reraise=True
+        ):
+            with attempt:
+                cached_content = await self._ensure_system_cache()
+                response = await self._post_generate(static_prefix, variable_suffix, cached_content)
+                
+                if response.status_code == 404 and cached_content:
+                    # Context cache expired or was evicted server-side; recreate it and retry once
+                    self.cached_content = None
+                    cached_content = await self._ensure_system_cache()
+                    response = await self._post_generate(static_prefix, variable_suffix, cached_content)
+                
+                response.raise_for_status()
+        
+        data = response.json()
+        text = "".join(part.get("text", "") for part in data["candidates"][0]["content"]["parts"])
+        
+        if self.cache_enabled:
+            self._cache.set(key, text, expire=self.CACHE_TTL_SECONDS)
+        return text
+    
+    async def _post_generate(self, static_prefix: str, variable_suffix: str,
+                             cached_content: Optional[str]):
+        """POST one generateContent request, within the concurrency and rate limits"""
+        body = {"contents": [{"role": "user", "parts": [{"text": variable_suffix}]}]}
+        
+        # With a context cache only the variable suffix is sent
+        if cached_content:
+            body["cachedContent"] = cached_content
+        else:
+            body["systemInstruction"] = {"parts": [{"text": static_prefix}]}
+        
+        client = self._get_client()
+        async with self._semaphore, self._rate_limiter:
+            return await client.post(
+                f"{self.endpoint}/{self.model}:generateContent",
+                params={"key": self.api_key},
+                json=body
+            )
+    
     def _call_api(self, prompt: str) -> str:
         """Internal method to call Gemini API"""
-        # Actual API implementation would go here
-        # For framework demonstration, this is stubbed
-        return "Generated content"
+        return self._run_sync(self._call_api_async(prompt))
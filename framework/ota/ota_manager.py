@@ -3,11 +3,22 @@ OTA Manager for SDV GenAI Framework
 Handles Over-The-Air service injection and updates
 """
 
-import json
+import copy
 import os
+import time
+from collections import defaultdict
+from functools import cached_property
 from typing import Dict, List, Any
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
+
+from ..core.fileio import atomic_write_bytes
+from ..core.serialization import dumps, dumps_pretty, loads
+
+
+def _now_iso() -> str:
+    """Current UTC time as an ISO 8601 string"""
+    return datetime.fromtimestamp(time.time(), tz=timezone.utc).isoformat()
 
 
 class OTAManager:
@@ -16,8 +27,35 @@ class OTAManager:
     def __init__(self, app_dir: str):
         self.app_dir = Path(app_dir)
         self.registry_file = self.app_dir / "service_registry.json"
-        self.ota_log_file = self.app_dir / "ota_history.json"
-        self.ota_history = self._load_ota_history()
+        self.ota_log_file = self.app_dir / "ota_history.jsonl"
+        # JSON-array history written by earlier versions; migrated on first load
+        self.legacy_ota_log_file = self.app_dir / "ota_history.json"
+        self._dir_ready = False
+    
+    # History and registry are loaded on first access, so constructing a manager does no I/O
+    
+    @cached_property
+    def ota_history(self) -> List[Dict[str, Any]]:
+        """OTA operation history, oldest first"""
+        return self._load_ota_history()
+    
+    @cached_property
+    def _history_by_service(self) -> Dict[str, List[Dict[str, Any]]]:
+        """OTA history records grouped by service name"""
+        history_by_service = defaultdict(list)
+        for record in self.ota_history:
+            history_by_service[record['service_name']].append(record)
+        return history_by_service
+    
+    @cached_property
+    def _registry_cache(self) -> Dict[str, Any]:
+        """In-memory service registry; the file is rewritten only on mutation"""
+        return self._load_registry()
+    
+    @cached_property
+    def _service_index(self) -> Dict[str, Dict[str, Any]]:
+        """Registry services keyed by name"""
+        return {s['name']: s for s in self._registry_cache['services']}
     
     def inject_service(self, service_definition: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -53,20 +91,16 @@ class OTAManager:
             print(f"Injecting new service '{service_definition['name']}'...")
             operation = "inject"
         
+        # One timestamp shared by the registry entry and the OTA record
+        timestamp = _now_iso()
+        
         # Register service
-        self._register_service(service_definition, operation)
+        self._register_service(service_definition, operation, timestamp)
+        self._flush_registry()
         
         # Log OTA operation
-        ota_record = {
-            "timestamp": datetime.now().isoformat(),
-            "operation": operation,
-            "service_name": service_definition['name'],
-            "version": service_definition.get('version', '1.0.0'),
-            "language": service_definition['language'],
-            "status": "success"
-        }
-        self.ota_history.append(ota_record)
-        self._save_ota_history()
+        ota_record = self._record_ota_operation(service_definition, operation, timestamp)
+        self._append_ota_history([ota_record])
         
         print(f"✓ Service '{service_definition['name']}' {operation}ed successfully!")
         
@@ -77,12 +111,65 @@ class OTAManager:
             "timestamp": ota_record['timestamp']
         }
     
+    def inject_services_bulk(self, services: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Inject several services via OTA as one transaction
+        
+        All definitions are validated before anything is applied; the registry
+        and OTA history are then written once for the whole batch.
+        
+        Args:
+            services: Complete service specifications
+            
+        Returns:
+            Overall status and per-service results (nothing is applied if any definition is invalid)
+        """
+        print(f"\n{'='*60}")
+        print(f"OTA Bulk Service Injection ({len(services)} services)")
+        print(f"{'='*60}\n")
+        
+        invalid = [not self._validate_service(service_definition) for service_definition in services]
+        if any(invalid):
+            return {
+                "status": "failed",
+                "error": "Invalid service definition",
+                "results": [
+                    {
+                        "status": "failed" if is_invalid else "skipped",
+                        "service_name": service_definition.get('name')
+                    }
+                    for service_definition, is_invalid in zip(services, invalid)
+                ]
+            }
+        
+        timestamp = _now_iso()
+        results = []
+        ota_records = []
+        
+        for service_definition in services:
+            operation = "update" if self._service_exists(service_definition['name']) else "inject"
+            self._register_service(service_definition, operation, timestamp)
+            ota_records.append(self._record_ota_operation(service_definition, operation, timestamp))
+            results.append({
+                "status": "success",
+                "operation": operation,
+                "service_name": service_definition['name'],
+                "timestamp": timestamp
+            })
+            print(f"✓ Service '{service_definition['name']}' {operation}ed")
+        
+        self._flush_registry()
+        self._append_ota_history(ota_records)
+        
+        return {
+            "status": "success",
+            "timestamp": timestamp,
+            "results": results
+        }
+    
     def get_service_registry(self) -> Dict[str, Any]:
-        """Get current service registry"""
-        if self.registry_file.exists():
-            with open(self.registry_file, 'r') as f:
-                return json.load(f)
-        return {"services": [], "version": "1.0.0"}
+        """Get a copy of the current service registry (the cache stays private)"""
+        return copy.deepcopy(self._registry_cache)
     
     def get_ota_history(self) -> List[Dict[str, Any]]:
         """Get OTA operation history"""
@@ -91,7 +178,7 @@ class OTAManager:
     def rollback_service(self, service_name: str) -> Dict[str, Any]:
         """Rollback a service to previous version"""
         # Find last version in OTA history
-        service_history = [h for h in self.ota_history if h['service_name'] == service_name]
+        service_history = self._history_by_service.get(service_name, [])
         
         if len(service_history) < 2:
             return {
@@ -127,73 +214,106 @@ class OTAManager:
     
     def _service_exists(self, service_name: str) -> bool:
         """Check if service already exists in registry"""
-        registry = self.get_service_registry()
-        
-        for service in registry.get('services', []):
-            if service.get('name') == service_name:
-                return True
-        
-        return False
+        return service_name in self._service_index
     
-    def _register_service(self, service_definition: Dict[str, Any], operation: str):
-        """Register service in the registry"""
-        registry = self.get_service_registry()
-        
+    def _register_service(self, service_definition: Dict[str, Any], operation: str, timestamp: str):
+        """Register service in the in-memory registry (saved by _flush_registry)"""
         if operation == "inject":
             # Add new service
-            registry['services'].append({
+            service = {
                 "name": service_definition['name'],
                 "language": service_definition['language'],
                 "version": service_definition.get('version', '1.0.0'),
                 "interfaces": service_definition.get('interfaces', []),
                 "dependencies": service_definition.get('dependencies', []),
                 "injected_via_ota": True,
-                "injection_date": datetime.now().isoformat()
-            })
+                "injection_date": timestamp
+            }
+            self._registry_cache['services'].append(service)
+            self._service_index[service['name']] = service
         else:
             # Update existing service
-            for service in registry['services']:
-                if service['name'] == service_definition['name']:
-                    service['version'] = service_definition.get('version', '1.0.0')
-                    service['updated_via_ota'] = True
-                    service['last_update'] = datetime.now().isoformat()
-                    break
-        
-        # Save registry
-        self.registry_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.registry_file, 'w') as f:
-            json.dump(registry, f, indent=2)
+            service = self._service_index[service_definition['name']]
+            service['version'] = service_definition.get('version', '1.0.0')
+            service['updated_via_ota'] = True
+            service['last_update'] = timestamp
+    
+    def _record_ota_operation(self, service_definition: Dict[str, Any], operation: str,
+                              timestamp: str) -> Dict[str, Any]:
+        """Add an OTA record to the in-memory history (saved by _append_ota_history)"""
+        ota_record = {
+            "timestamp": timestamp,
+            "operation": operation,
+            "service_name": service_definition['name'],
+            "version": service_definition.get('version', '1.0.0'),
+            "language": service_definition['language'],
+            "status": "success"
+        }
+        self.ota_history.append(ota_record)
+        self._history_by_service[ota_record['service_name']].append(ota_record)
+        return ota_record
+    
+    def _load_registry(self) -> Dict[str, Any]:
+        """Load service registry from file"""
+        if self.registry_file.exists():
+            with open(self.registry_file, 'rb') as f:
+                registry = loads(f.read())
+            registry.setdefault('services', [])
+            return registry
+        return {"services": [], "version": "1.0.0"}
+    
+    def _flush_registry(self):
+        """Save the in-memory registry to file"""
+        self._ensure_app_dir()
+        atomic_write_bytes(self.registry_file, dumps_pretty(self._registry_cache))
+    
+    def _ensure_app_dir(self):
+        """Create the application directory on the first write only"""
+        if not self._dir_ready:
+            self.app_dir.mkdir(parents=True, exist_ok=True)
+            self._dir_ready = True
     
     def _load_ota_history(self) -> List[Dict[str, Any]]:
-        """Load OTA history from file"""
+        """Load OTA history from file (one JSON record per line)"""
         if self.ota_log_file.exists():
-            with open(self.ota_log_file, 'r') as f:
-                return json.load(f)
+            with open(self.ota_log_file, 'rb') as f:
+                return [loads(line) for line in f if line.strip()]
+        
+        if self.legacy_ota_log_file.exists():
+            with open(self.legacy_ota_log_file, 'rb') as f:
+                history = loads(f.read())
+            self._append_ota_history(history)
+            print(f"Migrated {len(history)} OTA record(s) from {self.legacy_ota_log_file.name} "
+                  f"to {self.ota_log_file.name}")
+            return history
+        
         return []
     
-    def _save_ota_history(self):
-        """Save OTA history to file"""
-        self.ota_log_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.ota_log_file, 'w') as f:
-            json.dump(self.ota_history, f, indent=2)
+    def _append_ota_history(self, records: List[Dict[str, Any]]):
+        """Append OTA records to the history file in a single write"""
+        self._ensure_app_dir()
+        with open(self.ota_log_file, 'ab') as f:
+            f.write(b"".join(dumps(record) + b"\n" for record in records))
     
     def generate_ota_report(self) -> str:
         """Generate OTA operations report"""
-        report = f"""
+        parts = [f"""
 OTA Operations Report
 {'='*60}
 Application: {self.app_dir.name}
 Total OTA Operations: {len(self.ota_history)}
 
 Recent Operations:
-"""
+"""]
         
         for operation in self.ota_history[-5:]:  # Last 5 operations
-            report += f"\n  [{operation['timestamp']}]"
-            report += f"\n  Operation: {operation['operation'].upper()}"
-            report += f"\n  Service: {operation['service_name']}"
-            report += f"\n  Version: {operation['version']}"
-            report += f"\n  Status: {operation['status']}"
-            report += f"\n  {'-'*58}\n"
-        
-        return report
+            parts.extend([
+                f"\n  [{operation['timestamp']}]",
+                f"\n  Operation: {operation['operation'].upper()}",
+                f"\n  Service: {operation['service_name']}",
+                f"\n  Version: {operation['version']}",
+                f"\n  Status: {operation['status']}",
+                f"\n  {'-'*58}\n"
+            ])
+        
+        return "".join(parts)
@@ -9,9 +9,29 @@ from datetime import datetime
 import logging
 
 
+class _DefaultServiceFilter(logging.Filter):
+    """Fall back to the logger name for records not logged through a service adapter"""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, 'service'):
+            record.service = record.name
+        return True
+
+
+# One handler shared by every service; the service name is injected per record
+_SHARED_HANDLER = logging.StreamHandler()
+_SHARED_HANDLER.addFilter(_DefaultServiceFilter())
+_SHARED_HANDLER.setFormatter(
+    logging.Formatter('[%(service)s] %(asctime)s - %(levelname)s - %(message)s')
+)
+
+
 class ServiceBase(ABC):
     """Abstract base class for all SDV services"""
     
+    # Subclasses that add their own __slots__ stay free of a per-instance __dict__
+    __slots__ = ("service_name", "initialized", "version", "start_time", "logger")
+    
     def __init__(self, service_name: str):
         self.service_name = service_name
         self.initialized = False
@@ -19,19 +39,14 @@ class ServiceBase(ABC):
         self.start_time = None
         self.logger = self._setup_logger()
     
-    def _setup_logger(self) -> logging.Logger:
+    def _setup_logger(self) -> logging.LoggerAdapter:
         """Setup service logger"""
-        logger = logging.getLogger(self.service_name)
-        logger.setLevel(logging.INFO)
-        
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter(
-            f'[{self.service_name}] %(asctime)s - %(levelname)s - %(message)s'
-        )
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
+        base = logging.getLogger("sdv")
+        if not base.handlers:
+            base.setLevel(logging.INFO)
+            base.addHandler(_SHARED_HANDLER)
         
-        return logger
+        return logging.LoggerAdapter(base.getChild(self.service_name), {"service": self.service_name})
     
     def initialize(self) -> bool:
         """
@@ -3,10 +3,15 @@ Service Registry for SOA
 Manages service discovery and lifecycle
 """
 
-from typing import Dict, List, Any, Optional
-import json
+import itertools
+import types
+from collections import defaultdict, deque
+from typing import Dict, List, Any, Mapping, Optional, Tuple
 from pathlib import Path
 
+from ..core.fileio import atomic_write_bytes
+from ..core.serialization import dumps_pretty, loads
+
 
 class ServiceRegistry:
     """Central registry for managing SDV services"""
@@ -14,6 +19,17 @@ class ServiceRegistry:
     def __init__(self):
         self.services = {}
         self.service_metadata = {}
+        self._services_view = types.MappingProxyType(self.services)
+        # Directories already created by save_registry
+        self._ready_dirs = set()
+        # tag/language -> service names; lookups sort matches by registration position
+        self._tag_index: Dict[str, set] = defaultdict(set)
+        self._lang_index: Dict[str, set] = defaultdict(set)
+        # Position of each service in service_metadata, kept when a service is re-registered
+        self._positions: Dict[str, int] = {}
+        self._position_counter = itertools.count()
+        # (startup order, missing dependencies); invalidated whenever services change
+        self._dependency_cache: Optional[Tuple[List[str], Dict[str, List[str]]]] = None
     
     def register(self, service_name: str, service_instance: Any, metadata: Dict[str, Any] = None):
         """
@@ -26,9 +42,15 @@ class ServiceRegistry:
         """
         if service_name in self.services:
             print(f"Warning: Service '{service_name}' already registered. Updating...")
+        if service_name in self.service_metadata:
+            self._unindex(service_name)
+        else:
+            self._positions[service_name] = next(self._position_counter)
         
         self.services[service_name] = service_instance
         self.service_metadata[service_name] = metadata or {}
+        self._index(service_name)
+        self._dependency_cache = None
         
         print(f"✓ Service '{service_name}' registered successfully")
     
@@ -46,8 +68,11 @@ class ServiceRegistry:
             print(f"Error: Service '{service_name}' not found")
             return False
         
+        self._unindex(service_name)
+        del self._positions[service_name]
         del self.services[service_name]
         del self.service_metadata[service_name]
+        self._dependency_cache = None
         
         print(f"✓ Service '{service_name}' unregistered")
         return True
@@ -64,13 +89,18 @@ class ServiceRegistry:
         """
         return self.services.get(service_name)
     
-    def get_all_services(self) -> Dict[str, Any]:
-        """Get all registered services"""
-        return self.services.copy()
+    def get_all_services(self) -> Mapping[str, Any]:
+        """
+        Get all registered services
+        
+        Returns:
+            Live read-only view; change it through register/unregister, copy with dict() for a snapshot
+        """
+        return self._services_view
     
-    def get_service_metadata(self, service_name: str) -> Dict[str, Any]:
-        """Get metadata for a service"""
-        return self.service_metadata.get(service_name, {})
+    def get_service_metadata(self, service_name: str) -> Mapping[str, Any]:
+        """Get read-only metadata for a service"""
+        return types.MappingProxyType(self.service_metadata.get(service_name, {}))
     
     def list_services(self) -> List[str]:
         """List all registered service names"""
@@ -86,14 +116,35 @@ class ServiceRegistry:
         Returns:
             List of matching service names
         """
-        matches = []
-        
-        for service_name, metadata in self.service_metadata.items():
-            tags = metadata.get('tags', [])
-            if tag in tags:
-                matches.append(service_name)
+        return sorted(self._tag_index.get(tag, ()), key=self._positions.__getitem__)
+    
+    def find_services_by_language(self, language: str) -> List[str]:
+        """
+        Find services by implementation language
         
-        return matches
+        Args:
+            language: Language to search for (e.g. "cpp")
+            
+        Returns:
+            List of matching service names
+        """
+        return sorted(self._lang_index.get(language, ()), key=self._positions.__getitem__)
+    
+    def _index(self, service_name: str):
+        """Add a service to the tag and language indices"""
+        metadata = self.service_metadata.get(service_name, {})
+        for tag in metadata.get('tags', []):
+            self._tag_index[tag].add(service_name)
+        if 'language' in metadata:
+            self._lang_index[metadata['language']].add(service_name)
+    
+    def _unindex(self, service_name: str):
+        """Remove a service from the tag and language indices"""
+        metadata = self.service_metadata.get(service_name, {})
+        for tag in metadata.get('tags', []):
+            self._tag_index[tag].discard(service_name)
+        if 'language' in metadata:
+            self._lang_index[metadata['language']].discard(service_name)
     
     def get_dependency_graph(self) -> Dict[str, List[str]]:
         """
@@ -117,16 +168,51 @@ class ServiceRegistry:
         Returns:
             Dictionary of services with missing dependencies
         """
+        _, missing = self._analyze_dependencies()
+        return {service_name: list(deps) for service_name, deps in missing.items()}
+    
+    def startup_order(self) -> List[str]:
+        """
+        Get services ordered so that each starts after its dependencies
+        
+        Returns:
+            Service names in startup order; services in a dependency cycle are omitted
+        """
+        order, _ = self._analyze_dependencies()
+        return list(order)
+    
+    def _analyze_dependencies(self) -> Tuple[List[str], Dict[str, List[str]]]:
+        """Compute startup order (Kahn's algorithm) and missing dependencies in one pass"""
+        if self._dependency_cache is not None:
+            return self._dependency_cache
+        
+        in_degree = {service_name: 0 for service_name in self.service_metadata}
+        dependents: Dict[str, List[str]] = defaultdict(list)
         missing = {}
         
         for service_name, metadata in self.service_metadata.items():
             dependencies = metadata.get('dependencies', [])
             missing_deps = [dep for dep in dependencies if dep not in self.services]
-            
             if missing_deps:
                 missing[service_name] = missing_deps
+            
+            for dep in dependencies:
+                if dep in in_degree:
+                    dependents[dep].append(service_name)
+                    in_degree[service_name] += 1
         
-        return missing
+        ready = deque(name for name, degree in in_degree.items() if degree == 0)
+        order = []
+        while ready:
+            service_name = ready.popleft()
+            order.append(service_name)
+            for dependent in dependents[service_name]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    ready.append(dependent)
+        
+        self._dependency_cache = (order, missing)
+        return self._dependency_cache
     
     def save_registry(self, filepath: str):
         """Save registry metadata to file"""
@@ -135,41 +221,50 @@ class ServiceRegistry:
             "metadata": self.service_metadata
         }
         
-        Path(filepath).parent.mkdir(parents=True, exist_ok=True)
-        with open(filepath, 'w') as f:
-            json.dump(registry_data, f, indent=2)
+        directory = Path(filepath).parent
+        if directory not in self._ready_dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._ready_dirs.add(directory)
+        atomic_write_bytes(filepath, dumps_pretty(registry_data))
     
     def load_registry(self, filepath: str):
         """Load registry metadata from file"""
-        with open(filepath, 'r') as f:
-            registry_data = json.load(f)
+        with open(filepath, 'rb') as f:
+            registry_data = loads(f.read())
         
         self.service_metadata = registry_data.get('metadata', {})
+        
+        self._tag_index.clear()
+        self._lang_index.clear()
+        self._positions.clear()
+        self._dependency_cache = None
+        for service_name in self.service_metadata:
+            self._positions[service_name] = next(self._position_counter)
+            self._index(service_name)
     
     def generate_report(self) -> str:
         """Generate service registry report"""
-        report = f"""
+        parts = [f"""
 Service Registry Report
 {'='*60}
 Total Services: {len(self.services)}
 
 Registered Services:
-"""
+"""]
         
         for service_name, metadata in self.service_metadata.items():
-            report += f"\n  • {service_name}"
-            report += f"\n    Language: {metadata.get('language', 'N/A')}"
-            report += f"\n    Version: {metadata.get('version', 'N/A')}"
+            parts.append(f"\n  • {service_name}")
+            parts.append(f"\n    Language: {metadata.get('language', 'N/A')}")
+            parts.append(f"\n    Version: {metadata.get('version', 'N/A')}")
             deps = metadata.get('dependencies', [])
             if deps:
-                report += f"\n    Dependencies: {', '.join(deps)}"
-            report += "\n"
+                parts.append(f"\n    Dependencies: {', '.join(deps)}")
+            parts.append("\n")
         
         # Check for missing dependencies
         missing = self.validate_dependencies()
         if missing:
-            report += f"\n⚠ Missing Dependencies:\n"
-            for service, deps in missing.items():
-                report += f"  • {service}: {', '.join(deps)}\n"
+            parts.append("\n⚠ Missing Dependencies:\n")
+            parts.extend(f"  • {service}: {', '.join(deps)}\n" for service, deps in missing.items())
         
-        return report
+        return "".join(parts)